@@ -0,0 +1,125 @@
+"""Map description tables used to fill layout text and legend items."""
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+
+class MapDescription(NamedTuple):
+    """Description, legend units and legend image for a map type."""
+
+    desc: str
+    units: Optional[str]
+    legend: Optional[str]
+
+
+# -----------------------------
+# Map description lookup
+# -----------------------------
+DESCRIPTION_LOOKUP = {
+    "AGL": MapDescription("Sensor Altitude", "Sensor Altitude (m)", "AGL.png"),
+    "DTM": MapDescription(
+        "Digital Terrain Model", "Digital Terrain Model (m)", "DTM.png"
+    ),
+    "FlightPath": MapDescription("Flight Path", "", None),
+    "TMI": MapDescription(
+        "Total Magnetic Intensity", "Total Magnetic Intensity (nT)", "TMI.png"
+    ),
+    "TMI_RTP": MapDescription(
+        "Reduced to Pole TMI",
+        "Total Magnetic Intensity : Reduced to Pole (nT)",
+        "TMI_RTP.png",
+    ),
+    "TMI_AS": MapDescription(
+        "Analytical Signal", "Analytical Signal (nT/m)", "TMI_AS.png"
+    ),
+    "TMI_RTP_HD_TDR": MapDescription(
+        "Horizontal Derivative of the Tilt",
+        "Tilt Horizontal Derivative : Reduced to Pole TMI (rad/m)",
+        "TMI_RTP_HD_TDR.png",
+    ),
+    "TMI_RTP_RMI": MapDescription(
+        "Residual Magnetic Intensity", "IGRF corrected TMI (nT)", "TMI_RTP_RMI.png"
+    ),
+    "TMI_RTP_TDR": MapDescription(
+        "Tilt Derivative",
+        "Tilt Derivative: Reduced to Pole TMI (rad)",
+        "TMI_RTP_TDR.png",
+    ),
+    "TMI_RTP_THDR": MapDescription(
+        "Total Horizontal Gradient",
+        "Total Horizontal Gradient: Reduced to Pole TMI (nT/m)",
+        "TMI_RTP_THDR.png",
+    ),
+    "TMI_RTP_VD1": MapDescription(
+        "First Vertical Derivative",
+        "First Vertical Derivative: Reduced to Pole TMI (nT/m)",
+        "TMI_RTP_VD1.png",
+    ),
+    "Th-K_Ratio": MapDescription(
+        "Thorium / Potassium Ratio", "Th / K Ratio", "Th-K_Ratio"
+    ),
+    "U-K_Ratio": MapDescription(
+        "Uranium / Potassium Ratio", "U / K Ratio", "U-K_Ratio"
+    ),
+    "U-Th_Ratio": MapDescription(
+        "Uranium / Thorium Ratio", "U / Th Ratio", "U-Th_Ratio"
+    ),
+    "Ternary": MapDescription("Radiometric Ternary Image", None, "Ternary.png"),
+    "Total_NASVD": MapDescription(
+        "Radiometric Total Count", "Counts (cps)", "Total_NASVD.png"
+    ),
+    "Th_NASVD": MapDescription(
+        "Thorium NASVD Processed", "Thorium (ppm)", "Th_NASVD.png"
+    ),
+    "U_NASVD": MapDescription(
+        "Uranium NASVD Processed", "Uranium (ppm)", "U_NASVD.png"
+    ),
+    "K_NASVD": MapDescription(
+        "Potassium NASVD Processed", "Potassium (%)", "K_NASVD.png"
+    ),
+}
+
+# dB/dt z component channels and their time after turnoff (ms)
+_DBDT_CHANNELS = (
+    (10, "0.014"),
+    (15, "0.045"),
+    (20, "0.12"),
+    (25, "0.26"),
+    (30, "0.56"),
+    (35, "1.16"),
+    (40, "2.36"),
+    (45, "4.74"),
+)
+DESCRIPTION_LOOKUP.update(
+    {
+        f"dBdtZch{ch}": MapDescription(
+            f"dB/dt z component {t} ms\nafter turnoff",
+            f"dB/dt z component: channel {ch} (pV/(Am^4))",
+            f"dBdtZch{ch}.png",
+        )
+        for ch, t in _DBDT_CHANNELS
+    }
+)
+
+# Read-only: layout_editor memoizes lookups, so the tables must not change
+DESCRIPTION_LOOKUP = MappingProxyType(DESCRIPTION_LOOKUP)
+
+# Depth slice kinds, keyed by the layout_editor._RE_DEPTH_SLICE group name
+DEPTH_SLICE_LOOKUP = {
+    "cond": MapDescription(
+        "Conductivity Depth Slice", "Conductivity (mS/m)", "Conductivity.png"
+    ),
+    "susc": MapDescription(
+        "Susceptibility Depth Slice", "Susceptibility (SI)", "Susceptibility.png"
+    ),
+    "resid": MapDescription(
+        "Residual Filtered",
+        "Residual Filtered: Reduced to Pole TMI (nT)",
+        "TMI_RTP_residual.png",
+    ),
+    "regional": MapDescription(
+        "Regional Filtered",
+        "Regional Filtered: Reduced to Pole TMI (nT)",
+        "TMI_RTP_regional.png",
+    ),
+}
+DEPTH_SLICE_LOOKUP = MappingProxyType(DEPTH_SLICE_LOOKUP)
@@ -21,9 +21,9 @@
  *                                                                         *
  ***************************************************************************/
 """
+import logging
 import os
 import re
-import traceback
 
 from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, QTimer
 from qgis.PyQt.QtGui import QIcon
@@ -36,7 +36,16 @@ from qgis.core import (
     QgsReadWriteContext,
 )
 
-from .layout_editor import LayoutEditor
+from .layout_editor import (
+    CLIENT_LOCATION_ITEM_ID,
+    LEGEND_PICTURE_ITEM_ID,
+    LEGEND_UNIT_ITEM_ID,
+    MAP_DESCRIPTION_ITEM_ID,
+    TITLE_ITEM_ID,
+    LayoutEditor,
+)
+
+log = logging.getLogger(__name__)
 
 
 class GeophysicsMapping:
@@ -185,6 +194,8 @@ class GeophysicsMapping:
 
             self.last_selected_layer = self.settings.value("last_selected_layer", "")
 
+        # Files may have changed on disk since the dialog was last opened
+        self.layout_editor.clear_path_cache()
         self.dlg.show()
         QTimer.singleShot(100, self.update_layers_list)
 
@@ -283,7 +294,7 @@ class GeophysicsMapping:
         Applies styles, sets exception layers visibility, updates text and legend.
         """
         try:
-            print("Create button clicked - starting layout generation")
+            log.debug("Create button clicked - starting layout generation")
 
             # Collect UI inputs
             template_path = self.dlg.TemplatemQgsFileWidget.filePath()
@@ -318,7 +329,9 @@ class GeophysicsMapping:
                     existing.saveAsTemplate(
                         self.active_template_path, QgsReadWriteContext()
                     )
-                    print(f"Saved active layout template: {self.active_template_path}")
+                    log.debug(
+                        "Saved active layout template: %s", self.active_template_path
+                    )
 
             # Determine template to use
             if not self.current_layout:
@@ -331,7 +344,7 @@ class GeophysicsMapping:
             # Create layout
             layout = self.layout_editor.create_layout(use_template, layout_name)
             if not layout:
-                print("Layout could not be created.")
+                log.warning("Layout could not be created.")
                 return
 
             # Load and style raster
@@ -355,15 +368,19 @@ class GeophysicsMapping:
                     title_text, map_desc, units_text, legend_file = (
                         self.layout_editor.get_map_info(raster_path)
                     )
-                    self.layout_editor.update_text_item(layout, "Title", title_text)
                     self.layout_editor.update_text_item(
-                        layout, "Client-Location", self.layout_editor.client_location
+                        layout, TITLE_ITEM_ID, title_text
+                    )
+                    self.layout_editor.update_text_item(
+                        layout,
+                        CLIENT_LOCATION_ITEM_ID,
+                        self.layout_editor.client_location,
                     )
                     self.layout_editor.update_text_item(
-                        layout, "Map Description", map_desc
+                        layout, MAP_DESCRIPTION_ITEM_ID, map_desc
                     )
                     self.layout_editor.update_text_item(
-                        layout, "Legend Unit", units_text
+                        layout, LEGEND_UNIT_ITEM_ID, units_text
                     )
 
                     # Handle legend path
@@ -373,21 +390,20 @@ class GeophysicsMapping:
                         candidate_path = os.path.join(
                             raster_dir, "LEGENDS", legend_file
                         )
-                        if os.path.exists(candidate_path):
+                        if self.layout_editor.path_exists(candidate_path):
                             legend_path = candidate_path
-                    if not legend_path or not os.path.exists(legend_path):
+                    if not legend_path:
                         legend_path = self.dlg.LegendQgsFileWidget.filePath()
 
-                    if os.path.exists(legend_path):
+                    if self.layout_editor.path_exists(legend_path):
                         self.layout_editor.update_picture_item(
-                            layout, "Legend (Oasis)", legend_path
+                            layout, LEGEND_PICTURE_ITEM_ID, legend_path
                         )
 
             # Set current layout and open layout designer
             self.current_layout = layout
             self.iface.openLayoutDesigner(layout)
-            print(f"Layout '{layout_name}' created and opened successfully")
+            log.debug("Layout '%s' created and opened successfully", layout_name)
 
-        except Exception as e:
-            print("Error creating layout:", e)
-            print(traceback.format_exc())
+        except Exception:
+            log.exception("Error creating layout")
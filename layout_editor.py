@@ -1,5 +1,9 @@
+import functools
+import logging
 import os
 import re
+from typing import NamedTuple, Optional
+
 from qgis.core import (
     QgsPrintLayout,
     QgsLayoutItemMap,
@@ -9,101 +13,137 @@ from qgis.core import (
     QgsReadWriteContext,
     QgsRasterLayer,
 )
+from qgis.PyQt.QtCore import QFile, QIODevice
 from qgis.PyQt.QtXml import QDomDocument
 
+from .descriptions import DEPTH_SLICE_LOOKUP, DESCRIPTION_LOOKUP
+
+log = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+_TRANSPARENCY_QML = os.path.join(TEMPLATES_DIR, "transparency_style.qml")
+
+# Item IDs used by the Geophysics_SurveyMaps templates
+SATMAP_ITEM_ID = "SatMap"
+TITLE_ITEM_ID = "Title"
+CLIENT_LOCATION_ITEM_ID = "Client-Location"
+MAP_DESCRIPTION_ITEM_ID = "Map Description"
+LEGEND_UNIT_ITEM_ID = "Legend Unit"
+LEGEND_PICTURE_ITEM_ID = "Legend (Oasis)"
+
+# Basemap/context layers that hide_other_layers never hides by default
+DEFAULT_EXCEPTION_LAYERS = frozenset(
+    {
+        "Esri World Imagery (Clarity) Beta",
+        "Google Satellite Hybrid",
+        "property AOI",
+    }
+)
+
 # -----------------------------
-# Map description lookup
+# Filename patterns
 # -----------------------------
-DESCRIPTION_LOOKUP = {
-    "AGL": ("Sensor Altitude", "Sensor Altitude (m)", "AGL.png"),
-    "dBdtZch10": (
-        "dB/dt z component 0.014 ms after turnoff",
-        "dB/dt z component: channel 10 (pV/(Am^4))",
-        "dBdtZch10.png",
-    ),
-    "dBdtZch15": (
-        "dB/dt z component 0.045 ms after turnoff",
-        "dB/dt z component: channel 15 (pV/(Am^4))",
-        "dBdtZch15.png",
-    ),
-    "dBdtZch20": (
-        "dB/dt z component 0.12 ms after turnoff",
-        "dB/dt z component: channel 20 (pV/(Am^4))",
-        "dBdtZch20.png",
-    ),
-    "dBdtZch25": (
-        "dB/dt z component 0.26 ms after turnoff",
-        "dB/dt z component: channel 25 (pV/(Am^4))",
-        "dBdtZch25.png",
-    ),
-    "dBdtZch30": (
-        "dB/dt z component 0.56 ms after turnoff",
-        "dB/dt z component: channel 30 (pV/(Am^4))",
-        "dBdtZch30.png",
-    ),
-    "dBdtZch35": (
-        "dB/dt z component 1.16 ms after turnoff",
-        "dB/dt z component: channel 35 (pV/(Am^4))",
-        "dBdtZch35.png",
-    ),
-    "dBdtZch40": (
-        "dB/dt z component 2.36 ms after turnoff",
-        "dB/dt z component: channel 40 (pV/(Am^4))",
-        "dBdtZch40.png",
-    ),
-    "dBdtZch45": (
-        "dB/dt z component 4.74 ms after turnoff",
-        "dB/dt z component: channel 45 (pV/(Am^4))",
-        "dBdtZch45.png",
-    ),
-    "DTM": ("Digital Terrain Model", "Digital Terrain Model (m)", "DTM.png"),
-    "FlightPath": ("Flight Path", "", None),
-    "TMI": ("Total Magnetic Intensity", "Total Magnetic Intensity (nT)", "TMI.png"),
-    "TMI_RTP": (
-        "Reduced to Pole TMI",
-        "Total Magnetic Intensity : Reduced to Pole (nT)",
-        "TMI_RTP.png",
-    ),
-    "TMI_AS": ("Analytical Signal", "Analytical Signal (nT/m)", "TMI_AS.png"),
-    "TMI_RTP_HD_TDR": (
-        "Horizontal Derivative of the Tilt",
-        "Tilt Horizontal Derivative : Reduced to Pole TMI (rad/m)",
-        "TMI_RTP_HD_TDR.png",
-    ),
-    "TMI_RTP_RMI": (
-        "Residual Magnetic Intensity",
-        "IGRF corrected TMI (nT)",
-        "TMI_RTP_RMI.png",
-    ),
-    "TMI_RTP_TDR": (
-        "Tilt Derivative",
-        "Tilt Derivative: Reduced to Pole TMI (rad)",
-        "TMI_RTP_TDR.png",
-    ),
-    "TMI_RTP_THDR": (
-        "Total Horizontal Gradient",
-        "Total Horizontal Gradient: Reduced to Pole TMI (nT/m)",
-        "TMI_RTP_THDR.png",
-    ),
-    "TMI_RTP_VD1": (
-        "First Vertical Derivative",
-        "First Vertical Derivative: Reduced to Pole TMI (nT/m)",
-        "TMI_RTP_VD1.png",
-    ),
-    "Th-K_Ratio": ("Thorium / Potassium Ratio", "Th / K Ratio", "Th-K_Ratio"),
-    "U-K_Ratio": ("Uranium / Potassium Ratio", "U / K Ratio", "U-K_Ratio"),
-    "U-Th_Ratio": ("Uranium / Thorium Ratio", "U / Th Ratio", "U-Th_Ratio"),
-    "Ternary": ("Radiometric Ternary Image", None, "Ternary.png"),
-    "Total_NASVD": ("Radiometric Total Count", "Counts (cps)", "Total_NASVD.png"),
-    "Th_NASVD": ("Thorium NASVD Processed", "Thorium (ppm)", "Th_NASVD.png"),
-    "U_NASVD": ("Uranium NASVD Processed", "Uranium (ppm)", "U_NASVD.png"),
-    "K_NASVD": ("Potassium NASVD Processed", "Potassium (%)", "K_NASVD.png"),
-}
+# Datum prefixes stripped from filenames (compared lowercase)
+_DATUM_PREFIXES = ("wgs84", "nad83")
+# Each alternative captures its depth in a group named after the kind, so
+# match.lastgroup identifies which one hit.
+_RE_DEPTH_SLICE = re.compile(
+    r"(?:Conductivity\s*(?P<cond>\d+m)"
+    r"|Susceptibility\s*(?P<susc>\d+m)"
+    r"|TMI_RTP_residual\s*(?P<resid>\d+m)"
+    r"|TMI_RTP_regional\s*(?P<regional>\d+m))$",
+    re.IGNORECASE,
+)
+
+
+def _build_suffix_trie(keys):
+    """Build a trie over the reversed keys; terminal nodes hold the key under None."""
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in reversed(key):
+            node = node.setdefault(char, {})
+        node[None] = key
+    return trie
+
+
+_SUFFIX_TRIE = _build_suffix_trie(DESCRIPTION_LOOKUP)
+
+
+def _match_suffix(name):
+    """Return the longest DESCRIPTION_LOOKUP key that name ends with, or None."""
+    # Common case: the type code is the last word. Keys contain no whitespace,
+    # so an exact hit is also the longest suffix.
+    words = name.rsplit(None, 1)
+    if words and words[-1] in DESCRIPTION_LOOKUP:
+        return words[-1]
+    node = _SUFFIX_TRIE
+    matched_key = None
+    for char in reversed(name):
+        node = node.get(char)
+        if node is None:
+            break
+        matched_key = node.get(None, matched_key)
+    return matched_key
+
+
+class MapInfo(NamedTuple):
+    """Layout text and legend parsed from a raster filename."""
+
+    title: str
+    desc: str
+    units: Optional[str]
+    legend: Optional[str]
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_map_info(basename_no_ext):
+    """Extract map info from a basename without extension (memoized).
+
+    The lookup tables are module constants, so the result depends only on
+    the name and repeated layouts for the same raster skip the parsing.
+    """
+    if (
+        basename_no_ext[:5].lower() in _DATUM_PREFIXES
+        and basename_no_ext[5:6].isspace()
+    ):
+        basename_no_ext = basename_no_ext[5:]
+    remaining_name = basename_no_ext.strip()
+
+    # Depth slice / residual / regional matches. Every kind ends in "<digits>m",
+    # so names without that tail skip the regex search entirely.
+    match = (
+        remaining_name[-1:] in ("m", "M")
+        and remaining_name[-2:-1].isdigit()
+        and _RE_DEPTH_SLICE.search(remaining_name)
+    )
+    if match:
+        info = DEPTH_SLICE_LOOKUP[match.lastgroup]
+        depth = match.group(match.lastgroup)
+        title = remaining_name[: match.start()].strip()
+        map_desc = f"{info.desc}\n{depth.replace('m',' m')}"
+        return MapInfo(title, map_desc, info.units, info.legend)
+
+    # Standard lookup
+    matched_key = _match_suffix(remaining_name)
+    if matched_key:
+        title = remaining_name[: -len(matched_key)].strip()
+        info = DESCRIPTION_LOOKUP[matched_key]
+        return MapInfo(title, info.desc, info.units, info.legend)
+
+    return MapInfo(remaining_name, "", "", "")
 
 
 class LayoutEditor:
     """Handles layout creation, duplication, styling, and map item management."""
 
+    __slots__ = (
+        "client_location",
+        "templates_dir",
+        "exception_layers",
+        "_existing_paths",
+    )
+
     def __init__(self, exception_layers=None):
         """
         Initialize LayoutEditor.
@@ -112,20 +152,21 @@ class LayoutEditor:
             exception_layers (set[str], optional): Layers that should never be hidden.
         """
         self.client_location = ""
-        self.templates_dir = os.path.join(os.path.dirname(__file__), "templates")
-        self.exception_layers = exception_layers or {
-            "Esri World Imagery (Clarity) Beta",
-            "Google Satellite Hybrid",
-            "property AOI",
-        }
+        self.templates_dir = TEMPLATES_DIR
+        self._existing_paths = set()  # paths already confirmed by path_exists
+        self.exception_layers = (
+            frozenset(exception_layers)
+            if exception_layers
+            else DEFAULT_EXCEPTION_LAYERS
+        )
 
     # -----------------------------
     # Exception Layers Management
     # -----------------------------
     def set_exception_layers(self, layers_set):
         """Override the layers that are never hidden."""
-        self.exception_layers = set(layers_set)
-        print(f"Updated exception layers: {self.exception_layers}")
+        self.exception_layers = frozenset(layers_set)
+        log.debug("Updated exception layers: %s", self.exception_layers)
 
     # -----------------------------
     # Client Info
@@ -140,59 +181,85 @@ class LayoutEditor:
     # -----------------------------
     # Raster Styling
     # -----------------------------
+    def clear_path_cache(self):
+        """Forget cached file lookups (e.g. after legends or styles were moved)."""
+        self._existing_paths.clear()
+
+    def path_exists(self, path):
+        """os.path.exists that remembers hits, so repeat lookups skip the stat call."""
+        if path in self._existing_paths:
+            return True
+        if os.path.exists(path):
+            self._existing_paths.add(path)
+            return True
+        return False
+
     def apply_style_qml(self, raster_layer: QgsRasterLayer, qml_file):
         """Apply a QML style file to a raster layer."""
         try:
             if not isinstance(raster_layer, QgsRasterLayer):
-                print("Not a raster layer")
+                log.warning("Not a raster layer")
                 return False
-            if not os.path.exists(qml_file):
-                print(f"Style QML not found: {qml_file}")
+            if not self.path_exists(qml_file):
+                log.warning("Style QML not found: %s", qml_file)
                 return False
             success, error_message = raster_layer.loadNamedStyle(qml_file)
             if not success:
-                print(f"Failed to apply QML style: {error_message}")
+                log.warning("Failed to apply QML style: %s", error_message)
                 return False
             raster_layer.triggerRepaint()
-            print(f"Applied QML style: {os.path.basename(qml_file)}")
+            log.debug("Applied QML style: %s", os.path.basename(qml_file))
             return True
-        except Exception as e:
-            print(f"Error applying QML style: {e}")
+        except Exception:
+            log.exception("Error applying QML style")
             return False
 
     def apply_transparency_style(self, raster_layer: QgsRasterLayer):
         """Apply default transparency QML style (backward-compatible)."""
-        qml = os.path.join(self.templates_dir, "transparency_style.qml")
-        return self.apply_style_qml(raster_layer, qml)
+        return self.apply_style_qml(raster_layer, _TRANSPARENCY_QML)
 
     # -----------------------------
     # Layout Creation / Duplication
     # -----------------------------
+    def _read_template(self, template_path):
+        """Parse a QPT template straight from disk into a new QDomDocument."""
+        # Let Qt parse straight from the file instead of a Python string copy
+        template_file = QFile(template_path)
+        if not template_file.open(QIODevice.ReadOnly):
+            raise FileNotFoundError("Template file not found")
+        doc = QDomDocument()
+        try:
+            parsed, error_msg, error_line, _ = doc.setContent(template_file, False)
+        finally:
+            template_file.close()
+        if not parsed:
+            raise RuntimeError(
+                f"Failed to parse template (line {error_line}): {error_msg}"
+            )
+        return doc
+
     def create_layout(self, template_path, layout_name):
         """Create a new layout from a QPT template."""
+        project = QgsProject.instance()
+        layout_manager = project.layoutManager()
+        if layout_manager.layoutByName(layout_name):
+            log.warning('Map layout "%s" already exists.', layout_name)
+            return None
         try:
-            project = QgsProject.instance()
-            layout_manager = project.layoutManager()
-            if layout_manager.layoutByName(layout_name):
-                raise RuntimeError(f'Map layout "{layout_name}" already exists.')
-            if not os.path.exists(template_path):
-                raise FileNotFoundError("Template file not found")
-            with open(template_path, "r", encoding="utf-8") as file:
-                template_content = file.read()
-            doc = QDomDocument()
-            doc.setContent(template_content)
-            layout = QgsPrintLayout(project)
-            layout.initializeDefaults()
-            context = QgsReadWriteContext()
-            if not layout.loadFromTemplate(doc, context):
-                raise RuntimeError("Failed to load layout from template")
-            layout.setName(layout_name)
-            layout_manager.addLayout(layout)
-            print(f"Created layout from template: {os.path.basename(template_path)}")
-            return layout
-        except Exception as e:
-            print(f"Error creating layout: {e}")
+            doc = self._read_template(template_path)
+        except (OSError, RuntimeError):
+            log.exception("Error creating layout")
+            return None
+        layout = QgsPrintLayout(project)
+        layout.initializeDefaults()
+        _, loaded = layout.loadFromTemplate(doc, QgsReadWriteContext())
+        if not loaded:
+            log.warning("Failed to load layout from template: %s", template_path)
             return None
+        layout.setName(layout_name)
+        layout_manager.addLayout(layout)
+        log.debug("Created layout from template: %s", os.path.basename(template_path))
+        return layout
 
     def duplicate_layout(self, source_layout, new_name):
         """Duplicate an existing layout with all settings preserved."""
@@ -205,8 +272,8 @@ class LayoutEditor:
             new_layout.setName(new_name)
             layout_manager.addLayout(new_layout)
             return new_layout
-        except Exception as e:
-            print(f"Error duplicating layout: {e}")
+        except Exception:
+            log.exception("Error duplicating layout")
             return None
 
     # -----------------------------
@@ -219,51 +286,55 @@ class LayoutEditor:
                 not isinstance(raster_layer, QgsRasterLayer)
                 or not raster_layer.isValid()
             ):
-                print("Raster layer invalid or not found")
+                log.warning("Raster layer invalid or not found")
                 return False
-            map_item = layout.itemById("SatMap")
-            if isinstance(map_item, QgsLayoutItemMap):
+            map_item = layout.itemById(SATMAP_ITEM_ID)
+            if type(map_item) is QgsLayoutItemMap:
+                if map_item.layers() == [raster_layer] and not zoom_to_extent:
+                    return True  # already showing this raster, skip the re-render
                 map_item.setLayers([raster_layer])
                 if zoom_to_extent:
                     map_item.zoomToExtent(raster_layer.extent())
                 map_item.refresh()
                 return True
-        except Exception as e:
-            print(f"Error updating map item: {e}")
+        except Exception:
+            log.exception("Error updating map item")
         return False
 
     def update_text_item(self, layout, item_id, text):
         """Update a text label item in the layout."""
         try:
             item = layout.itemById(item_id)
-            if isinstance(item, QgsLayoutItemLabel) and text:
-                item.setText(text)
+            if type(item) is QgsLayoutItemLabel and text:
+                if item.text() != text:
+                    item.setText(text)
                 return True
-        except Exception as e:
-            print(f"Error updating text item: {e}")
+        except Exception:
+            log.exception("Error updating text item")
         return False
 
     def update_picture_item(self, layout, item_id, picture_path):
         """Update a picture (legend) item in the layout."""
         try:
-            if not picture_path or not os.path.exists(picture_path):
-                print("Legend/picture not found")
+            if not picture_path or not self.path_exists(picture_path):
+                log.warning("Legend/picture not found")
                 return False
             item = layout.itemById(item_id)
-            if isinstance(item, QgsLayoutItemPicture):
-                item.setPicturePath(picture_path)
-                item.refresh()
+            if type(item) is QgsLayoutItemPicture:
+                if item.picturePath() != picture_path:
+                    item.setPicturePath(picture_path)
+                    item.refresh()
                 return True
-        except Exception as e:
-            print(f"Error updating picture item: {e}")
+        except Exception:
+            log.exception("Error updating picture item")
         return False
 
     def get_item_by_id(self, layout, item_id):
         """Retrieve a layout item by its ID."""
         try:
             return layout.itemById(item_id)
-        except Exception as e:
-            print(f"Error getting item by ID: {e}")
+        except Exception:
+            log.exception("Error getting item by ID")
             return None
 
     # -----------------------------
@@ -272,16 +343,27 @@ class LayoutEditor:
     def hide_other_layers(self, keep_layer: QgsRasterLayer):
         """Hide all layers except keep_layer and exception layers."""
         project = QgsProject.instance()
-        layer_tree = project.layerTreeRoot()
-        for child in layer_tree.children():
-            layer = child.layer()
-            if layer and (layer == keep_layer or layer.name() in self.exception_layers):
-                child.setItemVisibilityChecked(True)
-            elif layer:
-                child.setItemVisibilityChecked(False)
-        kept_name = keep_layer.name() if keep_layer else "None"
-        print(
-            f"Applied hide-other-layers. Kept {kept_name} and exceptions: {self.exception_layers}"
+        # Decide visibility up front by layer ID, then flip each tree node once
+        show_ids = {
+            layer_id
+            for layer_id, layer in project.mapLayers().items()
+            if layer.name() in self.exception_layers
+        }
+        if keep_layer:
+            show_ids.add(keep_layer.id())
+        # findLayers() also returns layers nested in groups, in one C++ traversal.
+        # Only touch nodes that change, so unchanged layers emit no signals.
+        for node in project.layerTreeRoot().findLayers():
+            if node.layerId() in show_ids:
+                # Also check parent groups, or a kept layer in a hidden group stays off
+                if not node.isVisible():
+                    node.setItemVisibilityCheckedParentRecursive(True)
+            elif node.isItemVisibilityChecked():
+                node.setItemVisibilityChecked(False)
+        log.debug(
+            "Applied hide-other-layers. Kept %s and exceptions: %s",
+            keep_layer.name() if keep_layer else "None",
+            self.exception_layers,
         )
 
     # -----------------------------
@@ -289,63 +371,5 @@ class LayoutEditor:
     # -----------------------------
     def get_map_info(self, filename):
         """Extract map info: title, description, units, and legend from filename."""
-        basename_no_ext = os.path.splitext(os.path.basename(filename))[0]
-        match_prefix = re.match(r"^(WGS84|NAD83)\s+", basename_no_ext, re.IGNORECASE)
-        remaining_name = basename_no_ext[
-            (match_prefix.end() if match_prefix else 0) :
-        ].strip()
-
-        # Depth slice / residual / regional matches
-        depth_patterns = [
-            (
-                r"Conductivity\s*(\d+m)$",
-                "Conductivity Depth Slice",
-                "Conductivity (mS/m)",
-                "Conductivity.png",
-            ),
-            (
-                r"Susceptibility\s*(\d+m)$",
-                "Susceptibility Depth Slice",
-                "Susceptibility (SI)",
-                "Susceptibility.png",
-            ),
-            (
-                r"TMI_RTP_residual\s*(\d+m)$",
-                "Residual Filtered",
-                "Residual Filtered: Reduced to Pole TMI (nT)",
-                "TMI_RTP_residual.png",
-            ),
-            (
-                r"TMI_RTP_regional\s*(\d+m)$",
-                "Regional Filtered",
-                "Regional Filtered: Reduced to Pole TMI (nT)",
-                "TMI_RTP_regional.png",
-            ),
-        ]
-        for pattern, desc, units, legend in depth_patterns:
-            match = re.search(pattern, remaining_name, re.IGNORECASE)
-            if match:
-                depth = match.group(1)
-                title = remaining_name.replace(match.group(0), "").strip()
-                map_desc = f"{desc}\n{depth.replace('m',' m')}"
-                return title, map_desc, units, legend
-
-        # Standard lookup
-        matched_key = next(
-            (
-                k
-                for k in sorted(DESCRIPTION_LOOKUP.keys(), key=len, reverse=True)
-                if remaining_name.endswith(k)
-            ),
-            None,
-        )
-        if matched_key:
-            title = remaining_name[: -len(matched_key)].strip()
-            map_desc, units, legend = DESCRIPTION_LOOKUP[matched_key]
-            if matched_key.startswith("dBdtZch"):
-                parts = map_desc.split(" after ")
-                if len(parts) == 2:
-                    map_desc = parts[0] + "\n" + "after " + parts[1]
-            return title, map_desc, units, legend
-
-        return remaining_name, "", "", ""
+        basename = os.path.basename(filename)
+        return _parse_map_info(basename.rpartition(".")[0] or basename)